@@ -1,5 +1,6 @@
 from django.contrib import admin
 
+from .cache import bump_posts_version
 from .models import Category, Location, Post, Comment
 
 admin.site.empty_value_display = 'Не задано'
@@ -49,6 +50,7 @@ class PostAdmin(admin.ModelAdmin):
     list_editable = (
         'is_published',
     )
+    ordering = ('-pub_date',)
 
 
 class CommentAdmin(admin.ModelAdmin):
@@ -58,6 +60,17 @@ class CommentAdmin(admin.ModelAdmin):
         'created_at',
     )
 
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        Post.objects.filter(pk=obj.post_id).refresh_comment_count()
+        bump_posts_version()
+
+    def delete_queryset(self, request, queryset):
+        post_ids = list(queryset.values_list('post_id', flat=True))
+        super().delete_queryset(request, queryset)
+        Post.objects.filter(pk__in=post_ids).refresh_comment_count()
+        bump_posts_version()
+
 
 admin.site.register(Category, CategoryAdmin)
 admin.site.register(Location, LocationAdmin)
@@ -0,0 +1,34 @@
+from functools import wraps
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.views.decorators.cache import cache_page
+
+# With the default per-process LocMemCache a version bump only reaches the
+# process that handled the change; other workers keep serving their cached
+# pages until POSTS_CACHE_TIMEOUT expires. Configure a shared CACHES backend
+# to make invalidation immediate across processes.
+POSTS_CACHE_TIMEOUT = 60
+POSTS_VERSION_KEY = 'blog:posts_version'
+
+
+def posts_version():
+    return cache.get_or_set(POSTS_VERSION_KEY, lambda: uuid4().hex, None)
+
+
+def bump_posts_version():
+    cache.set(POSTS_VERSION_KEY, uuid4().hex, None)
+
+
+def cache_for_anonymous(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return view(request, *args, **kwargs)
+        # cache_page fixes key_prefix when it is applied, so it is rebuilt on
+        # each request to pick up the current posts version.
+        return cache_page(
+            POSTS_CACHE_TIMEOUT,
+            key_prefix=f'blog:{posts_version()}'
+        )(view)(request, *args, **kwargs)
+    return wrapper
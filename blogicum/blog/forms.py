@@ -14,7 +14,15 @@ class PostForm(forms.ModelForm):
 
     class Meta:
         model = Post
-        exclude = ('author', 'created_at',)
+        fields = (
+            'is_published',
+            'title',
+            'text',
+            'pub_date',
+            'location',
+            'category',
+            'image',
+        )
 
 
 class CommentForm(forms.ModelForm):
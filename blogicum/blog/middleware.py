@@ -0,0 +1,12 @@
+from django.utils import timezone
+
+
+def request_now(request):
+    return getattr(request, 'now', None) or timezone.now()
+
+
+def request_now_middleware(get_response):
+    def middleware(request):
+        request.now = timezone.now()
+        return get_response(request)
+    return middleware
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.16 on 2026-10-14 13:01
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_post_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='post',
+            options={'verbose_name': 'публикация', 'verbose_name_plural': 'Публикации'},
+        ),
+    ]
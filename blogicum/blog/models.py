@@ -1,5 +1,8 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 
 User = get_user_model()
 
@@ -50,6 +53,34 @@ class Location(PublishedModel):
         return f'{self.name[:20]} {super().__str__()}'
 
 
+class PostQuerySet(models.QuerySet):
+
+    def with_related(self):
+        return self.select_related(
+            'category',
+            'location',
+            'author',
+        ).order_by(
+            '-pub_date'
+        )
+
+    def published(self, now=None):
+        return self.with_related().filter(
+            pub_date__lte=now or timezone.now(),
+            is_published=True,
+            category__is_published=True,
+        )
+
+    def refresh_comment_count(self):
+        return self.update(comment_count=Coalesce(Subquery(
+            Comment.objects.filter(
+                post=OuterRef('pk')
+            ).order_by().values('post').annotate(
+                count=Count('pk')
+            ).values('count')
+        ), 0))
+
+
 class Post(PublishedModel):
     title = models.CharField(max_length=256, verbose_name='Название')
     text = models.TextField(verbose_name='Текст')
@@ -61,6 +92,7 @@ class Post(PublishedModel):
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name='posts',
         verbose_name='Автор публикации'
     )
@@ -75,6 +107,7 @@ class Post(PublishedModel):
     category = models.ForeignKey(
         Category,
         on_delete=models.SET_NULL,
+        db_index=False,
         null=True,
         related_name='posts',
         verbose_name='Категория',
@@ -84,11 +117,32 @@ class Post(PublishedModel):
         upload_to='blog_images',
         blank=True,
     )
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False,
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
-        ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('-pub_date',),
+                name='post_published_pub_date_idx',
+                condition=models.Q(is_published=True),
+            ),
+            models.Index(
+                fields=('category', '-pub_date'),
+                name='post_category_pub_date_idx',
+            ),
+            models.Index(
+                fields=('author', '-pub_date'),
+                name='post_author_pub_date_idx',
+            ),
+        )
 
     def __str__(self):
         return (
@@ -0,0 +1,31 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from blog.cache import bump_posts_version
+from blog.models import Category, Comment, Location, Post, User
+
+
+@receiver(post_save, sender=Comment)
+def increase_comment_count(sender, instance, created, **kwargs):
+    if created and not kwargs.get('raw'):
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1
+        )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_posts_cache(sender, **kwargs):
+    bump_posts_version()
+
+
+@receiver(post_save, sender=User)
+def invalidate_posts_cache_on_user_save(sender, update_fields=None, **kwargs):
+    if update_fields != {'last_login'}:
+        bump_posts_version()
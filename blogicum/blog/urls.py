@@ -1,6 +1,7 @@
 from django.urls import path
 
 from blog import views
+from blog.cache import cache_for_anonymous
 
 app_name = 'blog'
 
@@ -15,7 +16,7 @@ urlpatterns = [
          views.PostDetailView.as_view(),
          name='post_detail'),
     path('category/<slug:category_slug>/',
-         views.CategoryListView.as_view(),
+         cache_for_anonymous(views.CategoryListView.as_view()),
          name='category_posts'),
     path('profile/<str:username>/',
          views.ProfileListView.as_view(),
@@ -36,6 +37,6 @@ urlpatterns = [
          views.PostCreateView.as_view(),
          name='create_post'),
     path('',
-         views.IndexListView.as_view(),
+         cache_for_anonymous(views.IndexListView.as_view()),
          name='index'),
 ]
@@ -1,17 +1,48 @@
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse, reverse_lazy
-from django.utils import timezone
 from django.views.generic import (
     CreateView, DeleteView, DetailView, ListView, UpdateView
 )
 
+from blog.cache import bump_posts_version
 from blog.forms import CommentForm, PostForm, UserForm
+from blog.middleware import request_now
 from blog.models import Category, Comment, Post, User
 
 POSTS_PER_PAGE = 10
+COMMENTS_PER_PAGE = 10
+POST_CARD_FIELDS = (
+    'title',
+    'text',
+    'pub_date',
+    'image',
+    'is_published',
+    'comment_count',
+    'author__username',
+    'category__slug',
+    'category__title',
+    'category__is_published',
+    'location__name',
+    'location__is_published',
+)
+
+
+def comment_url(comment):
+    position = Comment.objects.filter(post_id=comment.post_id).filter(
+        Q(created_at__lt=comment.created_at)
+        | Q(created_at=comment.created_at, pk__lte=comment.pk)
+    ).count()
+    page = (position - 1) // COMMENTS_PER_PAGE + 1
+    return '{}?page={}#comment_{}'.format(
+        reverse('blog:post_detail', kwargs={'post_id': comment.post_id}),
+        page,
+        comment.pk,
+    )
 
 
 class PostCreateView(LoginRequiredMixin, CreateView):
@@ -36,44 +67,30 @@ class EditView(LoginRequiredMixin):
     pk_url_kwarg = 'post_id'
 
     def dispatch(self, request, *args, **kwargs):
-        if self.get_object().author != request.user:
+        self.object = self.get_object()
+        if self.object.author_id != request.user.id:
             return redirect(
                 'blog:post_detail',
                 post_id=self.kwargs[self.pk_url_kwarg]
             )
         return super().dispatch(request, *args, **kwargs)
 
-
-def posts_selection(posts):
-    return posts.select_related(
-        'category',
-        'location',
-        'author',
-    ).annotate(
-        comment_count=Count('comments')
-    ).order_by(
-        '-pub_date'
-    )
-
-
-def published_posts(posts):
-    return posts_selection(posts).filter(
-        pub_date__lte=timezone.now(),
-        is_published=True,
-        category__is_published=True,
-    )
+    def get_object(self, queryset=None):
+        return getattr(self, 'object', None) or super().get_object(queryset)
 
 
 class PostUpdateView(EditView, UpdateView):
     form_class = PostForm
 
     def get_context_data(self, **kwargs):
-        return dict(**(super().get_context_data(**kwargs)), is_edit=True)
+        context = super().get_context_data(**kwargs)
+        context['is_edit'] = True
+        return context
 
     def get_success_url(self):
         return reverse(
             'blog:post_detail',
-            kwargs={'post_id': self.get_object().pk}
+            kwargs={'post_id': self.object.pk}
         )
 
 
@@ -81,31 +98,44 @@ class PostDeleteView(EditView, DeleteView):
     success_url = reverse_lazy('blog:index')
 
     def get_context_data(self, **kwargs):
-        return dict(**(super().get_context_data(**kwargs)), is_delete=True)
+        context = super().get_context_data(**kwargs)
+        context['is_delete'] = True
+        return context
 
 
 class PostDetailView(DetailView):
     model = Post
     template_name = 'blog/detail.html'
-    paginate_by = POSTS_PER_PAGE
     pk_url_kwarg = 'post_id'
 
     def get_context_data(self, **kwargs):
-        return dict(
-            **super().get_context_data(**kwargs),
-            form=CommentForm(),
-            comments=(self.object.comments.select_related('post'))
-        )
+        page_obj = Paginator(
+            self.object.comments.select_related(
+                'author'
+            ).order_by('created_at', 'pk'),
+            COMMENTS_PER_PAGE
+        ).get_page(self.request.GET.get('page'))
+        context = super().get_context_data(**kwargs)
+        context['form'] = CommentForm()
+        context['comments'] = page_obj
+        context['page_obj'] = page_obj
+        return context
 
-    def get_queryset(self):
-        self.post_data = get_object_or_404(Post, pk=self.kwargs['post_id'])
-        if self.post_data.author == self.request.user:
-            return posts_selection(Post.objects).filter(
-                pk=self.kwargs['post_id']
-            )
-        return published_posts(Post.objects).filter(
-            pk=self.kwargs['post_id']
+    def get_object(self, queryset=None):
+        post = get_object_or_404(
+            Post.objects.with_related(),
+            pk=self.kwargs[self.pk_url_kwarg]
         )
+        if post.author_id == self.request.user.id:
+            return post
+        if (
+            not post.is_published
+            or post.category is None
+            or not post.category.is_published
+            or post.pub_date > request_now(self.request)
+        ):
+            raise Http404
+        return post
 
 
 class CategoryListView(ListView):
@@ -113,24 +143,23 @@ class CategoryListView(ListView):
     template_name = 'blog/category.html'
     paginate_by = POSTS_PER_PAGE
 
-    def get_context_data(self, **kwargs):
-        return dict(
-            **(super().get_context_data(**kwargs)),
-            category=get_object_or_404(
-                Category,
-                slug=self.kwargs['category_slug'],
-                is_published=True,
-            )
+    def get(self, request, *args, **kwargs):
+        self.category = get_object_or_404(
+            Category,
+            slug=self.kwargs['category_slug'],
+            is_published=True,
         )
+        return super().get(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['category'] = self.category
+        return context
 
     def get_queryset(self):
-        return published_posts(
-            get_object_or_404(
-                Category,
-                slug=self.kwargs.get('category_slug'),
-                is_published=True
-            ).posts
-        )
+        return self.category.posts.published(
+            request_now(self.request)
+        ).only(*POST_CARD_FIELDS)
 
 
 class ProfileListView(ListView):
@@ -138,21 +167,21 @@ class ProfileListView(ListView):
     template_name = 'blog/profile.html'
     paginate_by = POSTS_PER_PAGE
 
-    def get_context_data(self, **kwargs):
-        return dict(
-            **(super().get_context_data(**kwargs)),
-            profile=get_object_or_404(
-                User,
-                username=self.kwargs.get('username')
-            )
+    def get(self, request, *args, **kwargs):
+        self.profile = get_object_or_404(
+            User,
+            username=self.kwargs['username']
         )
+        return super().get(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['profile'] = self.profile
+        return context
 
     def get_queryset(self):
-        return posts_selection(
-            get_object_or_404(
-                User,
-                username=self.kwargs.get('username')
-            ).posts
+        return self.profile.posts.with_related().only(
+            *POST_CARD_FIELDS
         )
 
 
@@ -182,19 +211,23 @@ class CommentMixin:
     pk_url_kwarg = 'comment_id'
 
     def dispatch(self, request, *args, **kwargs):
-        if self.get_object().author != request.user:
+        self.object = self.get_object()
+        if self.object.author_id != request.user.id:
             return redirect(
                 'blog:post_detail',
                 self.kwargs.get('post_id')
             )
         return super().dispatch(request, *args, **kwargs)
 
+    def get_object(self, queryset=None):
+        return getattr(self, 'object', None) or get_object_or_404(
+            Comment,
+            pk=self.kwargs[self.pk_url_kwarg],
+            post_id=self.kwargs['post_id'],
+        )
+
     def form_valid(self, form):
         form.instance.author = self.request.user
-        form.instance.comment = get_object_or_404(
-            Post,
-            pk=self.kwargs['post_id']
-        )
         return super().form_valid(form)
 
     def get_success_url(self):
@@ -206,30 +239,49 @@ class CommentMixin:
 
 class CommentUpdateView(LoginRequiredMixin, CommentMixin, UpdateView):
 
+    def get_success_url(self):
+        return comment_url(self.object)
+
     def get_context_data(self, **kwargs):
-        return dict(**(super().get_context_data(**kwargs)), is_edit=True)
+        context = super().get_context_data(**kwargs)
+        context['is_edit'] = True
+        return context
 
 
 class CommentDeleteView(LoginRequiredMixin, CommentMixin, DeleteView):
 
+    def delete(self, request, *args, **kwargs):
+        response = super().delete(request, *args, **kwargs)
+        Post.objects.filter(pk=self.object.post_id).refresh_comment_count()
+        bump_posts_version()
+        return response
+
     def get_context_data(self, **kwargs):
-        return dict(**(super().get_context_data(**kwargs)), is_delete=True)
+        context = super().get_context_data(**kwargs)
+        context['is_delete'] = True
+        return context
 
 
 class IndexListView(ListView):
     model = Post
     template_name = 'blog/index.html'
     paginate_by = POSTS_PER_PAGE
-    queryset = published_posts(Post.objects)
+
+    def get_queryset(self):
+        return Post.objects.published(
+            request_now(self.request)
+        ).only(*POST_CARD_FIELDS)
 
 
 @login_required
 def add_comment(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
+    if not Post.objects.filter(pk=post_id).exists():
+        raise Http404
     form = CommentForm(request.POST)
     if form.is_valid():
         commentary = form.save(commit=False)
         commentary.author = request.user
-        commentary.post = post
+        commentary.post_id = post_id
         commentary.save()
+        return redirect(comment_url(commentary))
     return redirect('blog:post_detail', post_id=post_id)
@@ -0,0 +1,105 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def published_post(mixer, user):
+    return mixer.blend(
+        "blog.Post",
+        author=user,
+        is_published=True,
+        category__is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+
+
+def get_content(client, url="/"):
+    response = client.get(url)
+    assert response.status_code == 200
+    return response.content.decode("utf-8")
+
+
+def assert_change_shows_up(client, change, expected):
+    from blog.cache import posts_version
+
+    get_content(client)
+    version = posts_version()
+    change()
+    assert posts_version() != version
+    assert expected in get_content(client)
+
+
+@pytest.mark.django_db
+def test_anonymous_index_is_served_from_cache(
+        client, published_post, django_assert_num_queries):
+    get_content(client)
+    with django_assert_num_queries(0):
+        content = get_content(client)
+    assert published_post.title in content
+
+
+@pytest.mark.django_db
+def test_anonymous_category_is_served_from_cache(
+        client, published_post, django_assert_num_queries):
+    url = f"/category/{published_post.category.slug}/"
+    get_content(client, url)
+    with django_assert_num_queries(0):
+        get_content(client, url)
+
+
+@pytest.mark.django_db
+def test_post_change_invalidates_cache(client, published_post):
+    def change():
+        published_post.title = "NEWTITLE"
+        published_post.save()
+
+    assert_change_shows_up(client, change, "NEWTITLE")
+
+
+@pytest.mark.django_db
+def test_comment_change_invalidates_cache(client, mixer, published_post):
+    def change():
+        mixer.blend("blog.Comment", post=published_post)
+
+    assert_change_shows_up(client, change, "Комментарии (1)")
+
+
+@pytest.mark.django_db
+def test_category_change_invalidates_cache(client, published_post):
+    def change():
+        category = published_post.category
+        category.title = "NEWCATEGORY"
+        category.save()
+
+    assert_change_shows_up(client, change, "NEWCATEGORY")
+
+
+@pytest.mark.django_db
+def test_user_rename_invalidates_cache(client, user, published_post):
+    def change():
+        user.username = "renamed_author"
+        user.save()
+
+    assert_change_shows_up(client, change, "/profile/renamed_author/")
+
+
+@pytest.mark.django_db
+def test_authenticated_users_bypass_cache(
+        client, user_client, published_post):
+    from blog.models import Post
+
+    get_content(client)
+    get_content(user_client)
+    Post.objects.filter(pk=published_post.pk).update(title="NEWTITLE")
+    assert "NEWTITLE" not in get_content(client)
+    assert "NEWTITLE" in get_content(user_client)
@@ -6,12 +6,15 @@ from typing import Tuple, Any, Type, List, Union
 import django.test.client
 import pytest
 import pytz
+from django.core.management import call_command
 from django.db.models import TextField, DateTimeField, ForeignKey, Model
 from django.forms import BaseForm
 from django.utils import timezone
 
 from adapters.post import PostModelAdapter
-from conftest import _TestModelAttrs, KeyVal, get_a_post_get_response_safely
+from conftest import (
+    _TestModelAttrs, KeyVal, N_PER_FIXTURE, N_PER_PAGE,
+    get_a_post_get_response_safely)
 from fixtures.types import CommentModelAdapterT
 from form.base_form_tester import (
     FormValidationException, AuthorisedSubmitTester)
@@ -298,3 +301,64 @@ def test_404_on_comment_deleted_post(
         ),
         assert_created=False,
     )
+
+
+@pytest.mark.django_db
+def test_comment_count_is_kept_in_sync(mixer, user, user_client, tmp_path):
+    from blog.models import Comment, Post
+
+    post = mixer.blend("blog.Post", author=user)
+    comments = mixer.cycle(N_PER_FIXTURE).blend(
+        "blog.Comment", post=post, author=user
+    )
+    post.refresh_from_db()
+    assert post.comment_count == N_PER_FIXTURE
+
+    user_client.post(f"/posts/{post.id}/delete_comment/{comments[0].id}/")
+    post.refresh_from_db()
+    assert post.comment_count == N_PER_FIXTURE - 1
+
+    fixture = tmp_path / "blog.json"
+    call_command("dumpdata", "blog", "auth.user", output=str(fixture))
+    call_command("flush", interactive=False)
+    call_command("loaddata", str(fixture))
+    assert Post.objects.get(pk=post.pk).comment_count == N_PER_FIXTURE - 1
+    assert Comment.objects.filter(post_id=post.pk).count() == (
+        N_PER_FIXTURE - 1)
+
+
+@pytest.mark.django_db
+def test_post_delete_does_not_query_per_comment(
+        mixer, user, django_assert_max_num_queries):
+    post = mixer.blend("blog.Post", author=user)
+    mixer.cycle(N_PER_PAGE * 2).blend("blog.Comment", post=post, author=user)
+    with django_assert_max_num_queries(3):
+        post.delete()
+
+
+@pytest.mark.django_db
+def test_comments_are_paginated(mixer, user, user_client):
+    post = mixer.blend("blog.Post", author=user)
+    comments = mixer.cycle(N_PER_PAGE + 2).blend(
+        "blog.Comment", post=post, author=user
+    )
+    response = user_client.get(f"/posts/{post.id}/?page=2")
+    page_obj = response.context["page_obj"]
+    assert page_obj.number == 2
+    assert [c.id for c in page_obj] == [c.id for c in comments[N_PER_PAGE:]]
+    content = response.content.decode("utf-8")
+    assert f'name="comment_{comments[-1].id}"' in content
+    assert f'name="comment_{comments[0].id}"' not in content
+
+
+@pytest.mark.django_db
+def test_new_comment_redirects_to_its_page(mixer, user, user_client):
+    post = mixer.blend("blog.Post", author=user)
+    mixer.cycle(N_PER_PAGE).blend("blog.Comment", post=post, author=user)
+    response = user_client.post(
+        f"/posts/{post.id}/comment/", data={"text": "NEWCOMMENT"},
+        follow=True,
+    )
+    redirect_url, _ = response.redirect_chain[-1]
+    assert "?page=2#comment_" in redirect_url
+    assert "NEWCOMMENT" in response.content.decode("utf-8")